@@ -5,7 +5,7 @@ import shutil
 from datetime import datetime
 from pathlib import Path
 from tempfile import mkdtemp
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 from uuid import UUID
 
 import numpy as np
@@ -89,6 +89,28 @@ class ArrowTimeSeriesStorage(TimeSeriesStorageBase):
         msg = f"Bug: need to implement get_time_series for {type(metadata)}"
         raise NotImplementedError(msg)
 
+    def get_time_series_many(
+        self,
+        metadata: Sequence[TimeSeriesMetadata],
+        start_time: datetime | None = None,
+        length: int | None = None,
+    ) -> list[TimeSeriesData]:
+        # Multiple metadata instances can share one array. Read each file once.
+        batches: dict[UUID, pa.RecordBatch] = {}
+        time_series: list[TimeSeriesData] = []
+        for item in metadata:
+            if not isinstance(item, SingleTimeSeriesMetadata):
+                msg = f"Bug: need to implement get_time_series for {type(item)}"
+                raise NotImplementedError(msg)
+            base_ts = batches.get(item.time_series_uuid)
+            if base_ts is None:
+                base_ts = self._read_record_batch(item.time_series_uuid)
+                batches[item.time_series_uuid] = base_ts
+            time_series.append(
+                self._make_single_time_series(item, base_ts, start_time=start_time, length=length)
+            )
+        return time_series
+
     def remove_time_series(self, uuid: UUID) -> None:
         fpath = self._ts_directory.joinpath(f"{uuid}{EXTENSION}")
         if not fpath.exists():
@@ -102,6 +124,9 @@ class ArrowTimeSeriesStorage(TimeSeriesStorageBase):
         # will be overwritten by corresponding files from the src tree.
         if src is None:
             src = self._ts_directory
+        if Path(src).resolve() == Path(dst).resolve():
+            logger.debug("Time series data is already stored in {}", dst)
+            return
         shutil.copytree(src, dst, dirs_exist_ok=True)
         logger.info("Copied time series data to {}", dst)
 
@@ -111,10 +136,25 @@ class ArrowTimeSeriesStorage(TimeSeriesStorageBase):
         start_time: datetime | None = None,
         length: int | None = None,
     ) -> SingleTimeSeries:
-        fpath = self._ts_directory.joinpath(f"{metadata.time_series_uuid}{EXTENSION}")
+        base_ts = self._read_record_batch(metadata.time_series_uuid)
+        return self._make_single_time_series(
+            metadata, base_ts, start_time=start_time, length=length
+        )
+
+    def _read_record_batch(self, time_series_uuid: UUID) -> pa.RecordBatch:
+        fpath = self._ts_directory.joinpath(f"{time_series_uuid}{EXTENSION}")
         with pa.memory_map(str(fpath), "r") as source:
             base_ts = pa.ipc.open_file(source).get_record_batch(0)
             logger.trace("Reading time series from {}", fpath)
+        return base_ts
+
+    @staticmethod
+    def _make_single_time_series(
+        metadata: SingleTimeSeriesMetadata,
+        base_ts: pa.RecordBatch,
+        start_time: datetime | None = None,
+        length: int | None = None,
+    ) -> SingleTimeSeries:
         index, length = metadata.get_range(start_time=start_time, length=length)
         columns = base_ts.column_names
         if len(columns) != 1:
@@ -140,6 +180,8 @@ class ArrowTimeSeriesStorage(TimeSeriesStorageBase):
         )
 
     def get_raw_single_time_series(self, time_series_uuid: UUID) -> NDArray:
+        # Read into process memory rather than through a memory map: callers such as
+        # convert_storage keep the array after the file is closed.
         fpath = self._ts_directory.joinpath(f"{time_series_uuid}{EXTENSION}")
         with pa.OSFile(str(fpath), "r") as source:
             base_ts = pa.ipc.open_file(source).get_record_batch(0)
@@ -1,5 +1,6 @@
 """This module contains base class for handling pint quantity."""
 
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Type
 
 if TYPE_CHECKING:
@@ -86,4 +87,12 @@ class BaseQuantity(ureg.Quantity):  # type: ignore
     @classmethod
     def from_dict(cls, data: dict) -> "BaseQuantity":
         """Construct the quantity from a serialized dictionary."""
-        return cls(data["value"], data["units"])
+        return cls(data["value"], _parse_units(data["units"]))
+
+
+@lru_cache(maxsize=256)
+def _parse_units(units: str) -> pint.Unit:
+    # Serialized systems repeat a small number of unit strings many times and parsing them is
+    # much more expensive than constructing the quantity. Only the immutable Unit is cached;
+    # each call still creates a new quantity.
+    return ureg.Unit(units)
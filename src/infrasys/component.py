@@ -11,10 +11,10 @@ from infrasys.models import (
     InfraSysBaseModelWithIdentifers,
 )
 from infrasys.serialization import (
-    SerializedTypeMetadata,
-    SerializedComponentReference,
     SerializedQuantityType,
+    SerializedType,
     TYPE_METADATA,
+    serialize_type_metadata,
     serialize_value,
 )
 
@@ -30,13 +30,12 @@ class Component(InfraSysBaseModelWithIdentifers):
     def model_dump_custom(self, *args, **kwargs) -> dict[str, Any]:
         """Custom serialization for this package"""
         refs = {}
-        for x in self.model_fields:
+        for x in type(self).model_fields:
             val = self._model_dump_field(x)
             if val is not None:
                 refs[x] = val
-        exclude = kwargs.get("exclude", [])
-        exclude += list(set(exclude).union(refs))
-        kwargs["exclude"] = exclude
+        if refs:
+            kwargs["exclude"] = set(kwargs.get("exclude") or ()).union(refs)
         data = serialize_value(self, *args, **kwargs)
         data.update(refs)
         return data
@@ -49,12 +48,7 @@ class Component(InfraSysBaseModelWithIdentifers):
             val = [{TYPE_METADATA: serialize_component_reference(x)} for x in val]
         elif isinstance(val, BaseQuantity):
             data = val.to_dict()
-            data[TYPE_METADATA] = SerializedTypeMetadata(
-                fields=SerializedQuantityType(
-                    module=val.__module__,
-                    type=val.__class__.__name__,
-                ),
-            ).model_dump()
+            data[TYPE_METADATA] = serialize_type_metadata(type(val), SerializedQuantityType)
             val = data
         else:
             val = None
@@ -68,10 +62,15 @@ class Component(InfraSysBaseModelWithIdentifers):
 
 def serialize_component_reference(component: Component) -> dict[str, Any]:
     """Make a JSON serializable reference to a component."""
-    return SerializedTypeMetadata(
-        fields=SerializedComponentReference(
-            module=component.__module__,
-            type=component.__class__.__name__,
-            uuid=component.uuid,
-        ),
-    ).model_dump(by_alias=True)
+    # This is called for every composed component, so build the dict that
+    # SerializedTypeMetadata(fields=SerializedComponentReference(...)).model_dump() would return
+    # without validating a model.
+    cls = type(component)
+    return {
+        "fields": {
+            "module": cls.__module__,
+            "type": cls.__name__,
+            "serialized_type": SerializedType.COMPOSED_COMPONENT,
+            "uuid": str(component.uuid),
+        }
+    }
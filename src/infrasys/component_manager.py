@@ -178,6 +178,21 @@ class ComponentManager:
             raise ISNotStored(msg)
         return component
 
+    def get_by_uuid_many(self, uuids: Iterable[UUID]) -> list[Any]:
+        """Return the components with the input UUIDs, in the same order.
+
+        Raises
+        ------
+        ISNotStored
+            Raised if any UUID is not stored.
+        """
+        components_by_uuid = self._components_by_uuid
+        try:
+            return [components_by_uuid[x] for x in uuids]
+        except KeyError as e:
+            msg = f"No component with uuid={e.args[0]} is stored"
+            raise ISNotStored(msg) from e
+
     def iter_all(self) -> Iterable[Any]:
         """Return an iterator over all components."""
         return self._components_by_uuid.values()
@@ -186,23 +201,17 @@ class ComponentManager:
         self, component: Component, component_type: Optional[Type[Component]] = None
     ) -> list[Component]:
         """Return a list of all components that this component composes."""
-        return [
-            self.get_by_uuid(x)
-            for x in self._associations.list_child_components(
-                component, component_type=component_type
-            )
-        ]
+        return self.get_by_uuid_many(
+            self._associations.list_child_components(component, component_type=component_type)
+        )
 
     def list_parent_components(
         self, component: Component, component_type: Optional[Type[Component]] = None
     ) -> list[Component]:
         """Return a list of all components that compose this component."""
-        return [
-            self.get_by_uuid(x)
-            for x in self._associations.list_parent_components(
-                component, component_type=component_type
-            )
-        ]
+        return self.get_by_uuid_many(
+            self._associations.list_parent_components(component, component_type=component_type)
+        )
 
     def to_records(
         self,
@@ -76,7 +76,7 @@ class InMemoryTimeSeriesStorage(TimeSeriesStorageBase):
             raise ISNotStored(msg)
 
     def serialize(self, dst: Path | str, _: Optional[Path | str] = None) -> None:
-        base_directory = dst if isinstance(dst, Path) else Path(dst)
+        base_directory = Path(dst)
         storage = ArrowTimeSeriesStorage.create_with_permanent_directory(base_directory)
         for ts_uuid, ts in self._arrays.items():
             storage.add_raw_single_time_series(ts_uuid, ts)
@@ -1,6 +1,8 @@
 import enum
 import importlib
-from typing import Any, Literal, Annotated, Type, Union
+import types
+from functools import lru_cache
+from typing import Any, Literal, Annotated, Type, Union, get_args, get_origin
 from uuid import UUID
 
 from pydantic import Field, field_serializer
@@ -10,6 +12,9 @@ from infrasys.models import InfraSysBaseModel
 
 TYPE_METADATA = "__metadata__"
 
+# Field annotations consisting only of these types cannot hold composed components or quantities.
+_PLAIN_FIELD_TYPES = frozenset({bool, float, int, str, type(None), UUID})
+
 
 class SerializedType(str, enum.Enum):
     """Controls how types are serialized."""
@@ -65,45 +70,88 @@ class CachedTypeHelper:
 
     def __init__(self) -> None:
         self._observed_types: dict[tuple[str, str], Type] = {}
-        self._deserialized_types: set[Type] = set()
-
-    def add_deserialized_types(self, types: set[Type]) -> None:
-        """Add types that have been deserialized."""
-        self._deserialized_types.update(types)
-
-    def allowed_to_deserialize(self, component_type: Type) -> bool:
-        """Return True if the type can be deserialized."""
-        return component_type in self._deserialized_types
+        self._fields_to_deserialize: dict[Type, tuple[str, ...]] = {}
 
     def get_type(self, metadata: SerializedTypeBase) -> Type:
         """Return the type contained in metadata, dynamically importing as necessary."""
-        type_key = (metadata.module, metadata.type)
+        return self.get_type_by_name(metadata.module, metadata.type)
+
+    def get_type_by_name(self, module: str, type_name: str) -> Type:
+        """Return the type with the module and name, dynamically importing as necessary."""
+        type_key = (module, type_name)
         component_type = self._observed_types.get(type_key)
         if component_type is None:
             component_type = _deserialize_type(*type_key)
             self._observed_types[type_key] = component_type
         return component_type
 
+    def get_fields_to_deserialize(self, component_type: Type) -> tuple[str, ...]:
+        """Return the names of the fields of component_type that can hold composed components
+        or quantities. All other fields only hold plain values, which deserialization can pass
+        through without inspecting them.
+        """
+        fields = self._fields_to_deserialize.get(component_type)
+        if fields is None:
+            fields = tuple(
+                name
+                for name, field in component_type.model_fields.items()
+                if not _is_plain_annotation(field.annotation)
+            )
+            self._fields_to_deserialize[component_type] = fields
+        return fields
+
 
 def serialize_value(obj: InfraSysBaseModel, *args, **kwargs) -> dict[str, Any]:
     """Serialize an infrasys object to a dictionary."""
-    cls = type(obj)
     data = obj.model_dump(*args, mode="json", round_trip=True, **kwargs)
-    data[TYPE_METADATA] = SerializedTypeMetadata(
-        fields=SerializedBaseType(
-            module=cls.__module__,
-            type=cls.__name__,
-        ),
-    ).model_dump()
+    data[TYPE_METADATA] = serialize_type_metadata(type(obj), SerializedBaseType)
     return data
 
 
+def serialize_type_metadata(
+    cls: Type, serialized_type: Type[SerializedBaseType] | Type[SerializedQuantityType]
+) -> dict[str, Any]:
+    """Return the serialized type metadata for instances of cls."""
+    # The metadata is the same for every instance of a class, so only copy the cached dump.
+    fields = _serialize_type_metadata_fields(cls.__module__, cls.__name__, serialized_type)
+    return {"fields": fields.copy()}
+
+
+@lru_cache(maxsize=None)
+def _serialize_type_metadata_fields(
+    module: str,
+    type_name: str,
+    serialized_type: Type[SerializedBaseType] | Type[SerializedQuantityType],
+) -> dict[str, Any]:
+    metadata = SerializedTypeMetadata(fields=serialized_type(module=module, type=type_name))
+    return metadata.model_dump()["fields"]
+
+
 def deserialize_type(metadata: SerializedTypeBase) -> Type:
     """Dynamically import the type and return it."""
     return _deserialize_type(metadata.module, metadata.type)
 
 
-def _deserialize_type(module, obj_type) -> Type:
+def deserialize_type_by_name(module: str, type_name: str) -> Type:
+    """Dynamically import the type with the module and name and return it."""
+    return _deserialize_type(module, type_name)
+
+
+def _is_plain_annotation(annotation: Any) -> bool:
+    if annotation in _PLAIN_FIELD_TYPES:
+        return True
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _is_plain_annotation(get_args(annotation)[0])
+    if origin is Union or origin is types.UnionType:
+        return all(_is_plain_annotation(x) for x in get_args(annotation))
+    return False
+
+
+@lru_cache(maxsize=None)
+def _deserialize_type(module: str, obj_type: str) -> Type:
+    # Shared by all systems and the time series metadata store so that each distinct type is
+    # only imported and looked up once per process.
     mod = importlib.import_module(module)
     return getattr(mod, obj_type)
 
@@ -1,22 +1,22 @@
 """Defines a System"""
 
-import json
 import shutil
 import sqlite3
-from operator import itemgetter
+import zipfile
+from contextlib import contextmanager
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Callable, Iterable, Optional, Type, TypeVar
+from typing import Any, BinaryIO, Callable, Generator, Iterable, Optional, Type, TypeVar
 from uuid import UUID, uuid4
 
 from loguru import logger
-from rich import print as _pprint
-from rich.table import Table
+from pydantic_core import from_json, to_json
 
 from infrasys.exceptions import (
     ISFileExists,
     ISConflictingArguments,
+    ISOperationNotAllowed,
 )
 from infrasys.models import make_label
 from infrasys.component import (
@@ -25,10 +25,6 @@ from infrasys.component import (
 from infrasys.component_manager import ComponentManager
 from infrasys.serialization import (
     CachedTypeHelper,
-    SerializedTypeMetadata,
-    SerializedBaseType,
-    SerializedComponentReference,
-    SerializedQuantityType,
     SerializedType,
     TYPE_METADATA,
 )
@@ -38,6 +34,13 @@ from infrasys.utils.sqlite import backup, create_in_memory_db, restore
 
 T = TypeVar("T", bound="Component")
 
+_COMPOSED_COMPONENT = SerializedType.COMPOSED_COMPONENT.value
+_QUANTITY = SerializedType.QUANTITY.value
+# Top-level keys written by System.to_json. Parent classes cannot use these for extra attributes.
+_SYSTEM_KEYS = frozenset(
+    ("name", "description", "uuid", "data_format_version", "components", "time_series")
+)
+
 
 class System:
     """Implements behavior for systems"""
@@ -133,21 +136,22 @@ class System:
         INFO: Copied time series data to systems/system1_time_series
         """
         # TODO: how to get all python package info from environment?
-        if isinstance(filename, str):
-            filename = Path(filename)
+        filename = Path(filename)
         if filename.exists() and not overwrite:
             msg = f"{filename=} already exists. Choose a different path or set overwrite=True."
             raise ISFileExists(msg)
 
-        filename.parent.mkdir(exist_ok=True)
-        time_series_dir = filename.parent / (filename.stem + "_time_series")
-        time_series_dir.mkdir(exist_ok=True)
+        time_series_dir = self._make_time_series_directory(filename)
+        time_series_dir.mkdir(parents=True, exist_ok=True)
+        # Components are streamed into the file in place of this placeholder so that the
+        # serialized form of every component is never held in memory at once.
+        components_placeholder = f"__components_{uuid4().hex}__"
         system_data = {
             "name": self.name,
             "description": self.description,
             "uuid": str(self.uuid),
             "data_format_version": self.data_format_version,
-            "components": [x.model_dump_custom() for x in self._component_mgr.iter_all()],
+            "components": components_placeholder,
             "time_series": {
                 # Note: parent directory is stripped. De-serialization will find it from the
                 # parent of the JSON file.
@@ -155,7 +159,7 @@ class System:
             },
         }
         extra = self.serialize_system_attributes()
-        intersection = set(extra).intersection(system_data)
+        intersection = extra.keys() & _SYSTEM_KEYS
         if intersection:
             msg = f"Extra attributes from parent class collide with System: {intersection}"
             raise ISConflictingArguments(msg)
@@ -168,13 +172,49 @@ class System:
                 msg = "data contains the key 'system'"
                 raise ISConflictingArguments(msg)
             data["system"] = system_data
-        with open(filename, "w", encoding="utf-8") as f_out:
-            json.dump(data, f_out, indent=indent)
-            logger.info("Wrote system data to {}", filename)
-
+        try:
+            with open(filename, "wb") as f_out:
+                self._write_json(f_out, data, components_placeholder, indent)
+                logger.info("Wrote system data to {}", filename)
+        finally:
+            # Leave the caller's data as it was passed in.
+            if data is not system_data:
+                data.pop("system")
+
+        # Changes made inside bulk_time_series are not committed yet, and an open write
+        # transaction would block the backup.
+        self._con.commit()
         backup(self._con, time_series_dir / self.DB_FILENAME)
         self._time_series_mgr.serialize(time_series_dir)
 
+    def _write_json(
+        self,
+        f_out: BinaryIO,
+        data: dict[str, Any],
+        components_placeholder: str,
+        indent: int | None,
+    ) -> None:
+        text = to_json(data, indent=indent, inf_nan_mode="constants")
+        prefix, suffix = text.split(to_json(components_placeholder), maxsplit=1)
+        f_out.write(prefix)
+        if indent is None:
+            outer = inner = b""
+        else:
+            # Nest each component one level below the line that holds the components key, as
+            # the surrounding document is laid out.
+            line = prefix[prefix.rfind(b"\n") + 1 :]
+            outer = b"\n" + line[: len(line) - len(line.lstrip(b" "))]
+            inner = outer + b" " * indent
+        f_out.write(b"[")
+        has_components = False
+        for component in self._component_mgr.iter_all():
+            f_out.write(b"," + inner if has_components else inner)
+            text = to_json(component.model_dump_custom(), indent=indent, inf_nan_mode="constants")
+            f_out.write(text.replace(b"\n", inner) if inner else text)
+            has_components = True
+        f_out.write(outer + b"]" if has_components else b"]")
+        f_out.write(suffix)
+
     @classmethod
     def from_json(
         cls, filename: Path | str, upgrade_handler: Callable | None = None, **kwargs
@@ -194,11 +234,14 @@ class System:
         --------
         >>> system = System.from_json("systems/system1.json")
         """
-        with open(filename, encoding="utf-8") as f_in:
-            data = json.load(f_in)
-        time_series_parent_dir = Path(filename).parent
+        # pydantic_core's parser and serializer are significantly faster than the json module on
+        # large systems. The parser also caches the repeated key strings found in components.
+        path = Path(filename)
+        data = from_json(path.read_bytes())
+        # The parsed data is private to this call, so its components can be consumed while
+        # deserializing.
         return cls.from_dict(
-            data, time_series_parent_dir, upgrade_handler=upgrade_handler, **kwargs
+            data, path.parent, upgrade_handler=upgrade_handler, _consume_components=True, **kwargs
         )
 
     def to_records(
@@ -248,6 +291,8 @@ class System:
         data: dict[str, Any],
         time_series_parent_dir: Path | str,
         upgrade_handler: Callable | None = None,
+        *,
+        _consume_components: bool = False,
         **kwargs: Any,
     ) -> "System":
         """Deserialize a System from a dictionary.
@@ -269,11 +314,7 @@ class System:
         """
         system_data = data if "system" not in data else data["system"]
         ts_kwargs = {k: v for k, v in kwargs.items() if k in TIME_SERIES_KWARGS}
-        ts_path = (
-            time_series_parent_dir
-            if isinstance(time_series_parent_dir, Path)
-            else Path(time_series_parent_dir)
-        )
+        ts_path = Path(time_series_parent_dir)
         con = create_in_memory_db()
         restore(con, ts_path / data["time_series"]["directory"] / System.DB_FILENAME)
         time_series_manager = TimeSeriesManager.deserialize(
@@ -302,7 +343,15 @@ class System:
                     system.data_format_version,
                 )
         system.deserialize_system_attributes(system_data)
-        system._deserialize_components(system_data["components"])
+        if _consume_components:
+            # The caller does not need data afterwards. Removing the components lets each
+            # dictionary be freed as soon as its component is created.
+            components = system_data.pop("components")
+        else:
+            # Deserialization replaces top-level values in each component dictionary, so a
+            # shallow copy keeps the caller's data intact.
+            components = [dict(x) for x in system_data["components"]]
+        system._deserialize_components(components)
         logger.info("Deserialized system {}", system.label)
         return system
 
@@ -354,8 +403,7 @@ class System:
         --------
         to_json: System serialization
         """
-        if isinstance(fpath, str):
-            fpath = Path(fpath)
+        fpath = Path(fpath)
 
         if fpath.exists() and not overwrite:
             msg = f"{fpath} exists already. To overwrite the folder pass `overwrite=True`"
@@ -366,7 +414,7 @@ class System:
 
         if zip:
             logger.debug("Archiving system and time series into a single zip file at {}", fpath)
-            _ = shutil.make_archive(str(fpath), "zip", fpath)
+            _zip_directory(fpath, fpath.with_name(fpath.name + ".zip"))
             logger.debug("Removing {}", fpath)
             shutil.rmtree(fpath)
             logger.info("System archived at {}", fpath)
@@ -709,14 +757,9 @@ class System:
         >>> system.remove_component(gen)
         """
         self._component_mgr.raise_if_not_attached(component)
-        if self.has_time_series(component):
-            for metadata in self._time_series_mgr.list_time_series_metadata(component):
-                self.remove_time_series(
-                    component,
-                    time_series_type=metadata.get_time_series_data_type(),
-                    variable_name=metadata.variable_name,
-                    **metadata.user_attributes,
-                )
+        if self._time_series_mgr.has_time_series(component, time_series_type=None):
+            # Remove all of the component's time series with one query instead of one per array.
+            self._time_series_mgr.remove(component, time_series_type=None)
         component = self._component_mgr.remove(component, cascade_down=cascade_down, force=force)
 
     def remove_component_by_name(
@@ -840,6 +883,20 @@ class System:
         """
         return self._time_series_mgr.add(time_series, *components, **user_attributes)
 
+    @contextmanager
+    def bulk_time_series(self) -> Generator[None, None, None]:
+        """Context manager to use when adding or removing many time series. The time series
+        metadata is committed once when the block exits instead of once per call.
+
+        Examples
+        --------
+        >>> with system.bulk_time_series():
+        ...     for gen in system.get_components(Generator):
+        ...         system.add_time_series(make_time_series(gen), gen)
+        """
+        with self._time_series_mgr.bulk_update():
+            yield
+
     def copy_time_series(
         self,
         dst: Component,
@@ -1192,130 +1249,75 @@ class System:
         return self.time_series.storage.get_time_series_directory()
 
     def _deserialize_components(self, components: list[dict[str, Any]]) -> None:
-        """Deserialize components from dictionaries and add them to the system."""
+        """Deserialize components from dictionaries and add them to the system. Empties the
+        list.
+        """
         cached_types = CachedTypeHelper()
-        skipped_types = self._deserialize_components_first_pass(components, cached_types)
-        if skipped_types:
-            self._deserialize_components_nested(skipped_types, cached_types)
-
-    def _deserialize_components_first_pass(
-        self, components: list[dict], cached_types: CachedTypeHelper
-    ) -> dict[Type, list[dict[str, Any]]]:
-        deserialized_types = set()
-        skipped_types: dict[Type, list[dict[str, Any]]] = defaultdict(list)
-        for component_dict in components:
-            component = self._try_deserialize_component(component_dict, cached_types)
-            if component is None:
-                metadata = SerializedTypeMetadata(**component_dict[TYPE_METADATA])
-                assert isinstance(metadata.fields, SerializedBaseType)
-                component_type = cached_types.get_type(metadata.fields)
-                skipped_types[component_type].append(component_dict)
-            else:
-                deserialized_types.add(type(component))
-
-        cached_types.add_deserialized_types(deserialized_types)
-        return skipped_types
-
-    def _deserialize_components_nested(
-        self,
-        skipped_types: dict[Type, list[dict[str, Any]]],
-        cached_types: CachedTypeHelper,
-    ) -> None:
-        max_iterations = len(skipped_types)
-        for _ in range(max_iterations):
-            deserialized_types = set()
-            for component_type, components in skipped_types.items():
-                component = self._try_deserialize_component(components[0], cached_types)
-                if component is None:
-                    continue
-                if len(components) > 1:
-                    for component_dict in components[1:]:
-                        component = self._try_deserialize_component(component_dict, cached_types)
-                        assert component is not None
-                deserialized_types.add(component_type)
-
-            for component_type in deserialized_types:
-                skipped_types.pop(component_type)
-            cached_types.add_deserialized_types(deserialized_types)
-
-        if skipped_types:
-            msg = f"Bug: still have types remaining to be deserialized: {skipped_types.keys()}"
-            raise Exception(msg)
-
-    def _try_deserialize_component(
+        ordered = _sort_components_by_references(components)
+        components.clear()
+        # Consume the list in order so that each dictionary can be freed once its component
+        # is built.
+        ordered.reverse()
+        while ordered:
+            self._deserialize_component(ordered.pop(), cached_types)
+
+    def _deserialize_component(
         self, component: dict[str, Any], cached_types: CachedTypeHelper
     ) -> Any:
-        actual_component = None
-        values = self._deserialize_fields(component, cached_types)
-        if values is None:
-            return None
-
-        metadata = SerializedTypeMetadata(**component[TYPE_METADATA])
-        component_type = cached_types.get_type(metadata.fields)
+        # Remove the type metadata so that the field loop does not have to skip it.
+        # The metadata was written by serialize_value, so read it directly instead of validating
+        # a model for every component.
+        fields = component.pop(TYPE_METADATA)["fields"]
+        component_type = cached_types.get_type_by_name(fields["module"], fields["type"])
+        values = self._deserialize_fields(component, component_type, cached_types)
         actual_component = component_type(**values)
         self._components.add(actual_component, deserialization_in_progress=True)
         return actual_component
 
     def _deserialize_fields(
-        self, component: dict[str, Any], cached_types: CachedTypeHelper
-    ) -> dict | None:
-        values = {}
-        for field, value in component.items():
-            if isinstance(value, dict) and TYPE_METADATA in value:
-                metadata = SerializedTypeMetadata(**value[TYPE_METADATA])
-                if isinstance(metadata.fields, SerializedComponentReference):
-                    composed_value = self._deserialize_composed_value(
-                        metadata.fields, cached_types
-                    )
-                    if composed_value is None:
-                        return None
-                    values[field] = composed_value
-                elif isinstance(metadata.fields, SerializedQuantityType):
-                    quantity_type = cached_types.get_type(metadata.fields)
-                    values[field] = quantity_type(value=value["value"], units=value["units"])
+        self,
+        component: dict[str, Any],
+        component_type: Type[Component],
+        cached_types: CachedTypeHelper,
+    ) -> dict[str, Any]:
+        """Replace serialized composed components and quantities in component with their
+        deserialized values. Modifies component in place and returns it.
+
+        All composed components must already be stored.
+        """
+        # Bind these to locals because this loop runs for every component.
+        get_by_uuid = self._components.get_by_uuid
+        deserialize_composed_list = self._deserialize_composed_list
+        get_type_by_name = cached_types.get_type_by_name
+        values = component
+        # This is empty for components that only have plain fields.
+        for field in cached_types.get_fields_to_deserialize(component_type):
+            value: Any = component.get(field)
+            # Values come from a JSON parser, so exact type checks are sufficient and are cheaper
+            # than isinstance.
+            value_type = type(value)
+            if value_type is dict and (metadata := value.get(TYPE_METADATA)) is not None:
+                fields = metadata["fields"]
+                serialized_type = fields["serialized_type"]
+                if serialized_type == _COMPOSED_COMPONENT:
+                    values[field] = get_by_uuid(UUID(fields["uuid"]))
+                elif serialized_type == _QUANTITY:
+                    quantity_type = get_type_by_name(fields["module"], fields["type"])
+                    values[field] = quantity_type.from_dict(value)
                 else:
                     msg = f"Bug: unhandled type: {field=} {value=}"
                     raise NotImplementedError(msg)
-            elif (
-                isinstance(value, list)
-                and value
-                and isinstance(value[0], dict)
-                and TYPE_METADATA in value[0]
-                and value[0][TYPE_METADATA]["fields"]["serialized_type"]
-                == SerializedType.COMPOSED_COMPONENT.value
-            ):
-                metadata = SerializedTypeMetadata(**value[0][TYPE_METADATA])
-                assert isinstance(metadata.fields, SerializedComponentReference)
-                composed_values = self._deserialize_composed_list(value, cached_types)
-                if composed_values is None:
-                    return None
-                values[field] = composed_values
-            elif field != TYPE_METADATA:
-                values[field] = value
+            elif _is_composed_list(value_type, value):
+                values[field] = deserialize_composed_list(value)
 
         return values
 
-    def _deserialize_composed_value(
-        self, metadata: SerializedComponentReference, cached_types: CachedTypeHelper
-    ) -> Any:
-        component_type = cached_types.get_type(metadata)
-        if cached_types.allowed_to_deserialize(component_type):
-            return self._components.get_by_uuid(metadata.uuid)
-        return None
-
-    def _deserialize_composed_list(
-        self, components: list[dict[str, Any]], cached_types: CachedTypeHelper
-    ) -> list[Any] | None:
-        deserialized_components = []
-        for component in components:
-            metadata = SerializedTypeMetadata(**component[TYPE_METADATA])
-            assert isinstance(metadata.fields, SerializedComponentReference)
-            component_type = cached_types.get_type(metadata.fields)
-            if cached_types.allowed_to_deserialize(component_type):
-                deserialized_components.append(self._components.get_by_uuid(metadata.fields.uuid))
-            else:
-                return None
-        return deserialized_components
+    def _deserialize_composed_list(self, components: list[dict[str, Any]]) -> list[Component]:
+        # Lists can hold thousands of references. Read the UUIDs directly instead of validating
+        # a model for each one.
+        return self._components.get_by_uuid_many(
+            UUID(x[TYPE_METADATA]["fields"]["uuid"]) for x in components
+        )
 
     @staticmethod
     def _make_time_series_directory(filename: Path) -> Path:
@@ -1334,6 +1336,84 @@ class System:
         info.render()
 
 
+def _is_composed_list(value_type: type, value: Any) -> bool:
+    if value_type is not list or not value:
+        return False
+    first = value[0]
+    if type(first) is not dict:
+        return False
+    metadata = first.get(TYPE_METADATA)
+    return metadata is not None and metadata["fields"]["serialized_type"] == _COMPOSED_COMPONENT
+
+
+def _list_component_references(component: dict[str, Any]) -> list[str]:
+    """Return the UUIDs of the components referenced by a serialized component."""
+    refs = []
+    for value in component.values():
+        value_type = type(value)
+        if value_type is dict:
+            metadata = value.get(TYPE_METADATA)
+            if metadata is not None:
+                fields = metadata["fields"]
+                if fields["serialized_type"] == _COMPOSED_COMPONENT:
+                    refs.append(fields["uuid"])
+        elif _is_composed_list(value_type, value):
+            refs.extend(x[TYPE_METADATA]["fields"]["uuid"] for x in value)
+    return refs
+
+
+def _sort_components_by_references(components: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return the serialized components ordered so that each one follows every component that
+    it references. Otherwise, the original order is preserved.
+    """
+    # Kahn's algorithm over the reference graph. References to UUIDs that are not in the list
+    # are ignored here and reported when the component is deserialized.
+    uuids = {x["uuid"] for x in components}
+    num_pending: list[int] = []
+    dependents: dict[str, list[int]] = defaultdict(list)
+    for i, component in enumerate(components):
+        refs = {x for x in _list_component_references(component) if x in uuids}
+        num_pending.append(len(refs))
+        for ref in refs:
+            dependents[ref].append(i)
+
+    ordered = [x for x, count in zip(components, num_pending) if count == 0]
+    for component in ordered:
+        for i in dependents.pop(component["uuid"], ()):
+            num_pending[i] -= 1
+            if num_pending[i] == 0:
+                ordered.append(components[i])
+
+    if len(ordered) != len(components):
+        labels = [
+            make_label(x[TYPE_METADATA]["fields"]["type"], x.get("name") or x["uuid"])
+            for x, count in zip(components, num_pending)
+            if count > 0
+        ]
+        msg = f"Components have circular references and cannot be deserialized: {labels}"
+        raise ISOperationNotAllowed(msg)
+    return ordered
+
+
+def _zip_directory(src: Path, dst: Path) -> None:
+    """Archive the contents of src into dst.
+    Time series arrays are binary data that compress poorly, so deflating them costs far more
+    time than it saves in space; they are stored as is. The system JSON file compresses well
+    and is deflated at the fastest level. Files are streamed into the archive in chunks.
+    """
+    with zipfile.ZipFile(dst, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for path in sorted(src.rglob("*")):
+            if path.suffix == ".json":
+                zf.write(
+                    path,
+                    arcname=path.relative_to(src),
+                    compress_type=zipfile.ZIP_DEFLATED,
+                    compresslevel=1,
+                )
+            else:
+                zf.write(path, arcname=path.relative_to(src))
+
+
 class SystemInfo:
     """Class to store system component info"""
 
@@ -1355,6 +1435,10 @@ class SystemInfo:
 
     def render(self) -> None:
         """Render Summary information from the system."""
+        # rich.table is only needed here and is slow to import.
+        from rich import print as _pprint
+        from rich.table import Table
+
         (
             component_count,
             time_series_count,
@@ -1410,12 +1494,13 @@ class SystemInfo:
         time_series_table.add_column("No. Components", justify="right")
         time_series_table.add_column("No. Components with Time Series", justify="right")
 
+        # The counts are already ordered by the metadata store's query.
         for (
             component_type,
             time_series_type,
             time_series_start_time,
             time_series_resolution,
-        ), time_series_count in sorted(time_series_type_count.items(), key=itemgetter(slice(4))):
+        ), time_series_count in time_series_type_count.items():
             time_series_table.add_row(
                 f"{component_type}",
                 f"{time_series_type}",
@@ -1,9 +1,10 @@
 """Manages time series arrays"""
 
 import sqlite3
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional, Type
+from typing import Any, Generator, Optional, Type
 
 from loguru import logger
 
@@ -73,6 +74,14 @@ class TimeSeriesManager:
         """Return the time series storage object."""
         return self._storage
 
+    @contextmanager
+    def bulk_update(self) -> Generator[None, None, None]:
+        """Context manager that commits time series metadata once, at exit, instead of once
+        per addition or removal.
+        """
+        with self._metadata_store.bulk_update():
+            yield
+
     def add(
         self,
         time_series: TimeSeriesData,
@@ -103,11 +112,10 @@ class TimeSeriesManager:
             msg = "add_time_series requires at least one component"
             raise ISOperationNotAllowed(msg)
 
-        ts_type = type(time_series)
-        if not issubclass(ts_type, TimeSeriesData):
-            msg = f"The first argument must be an instance of TimeSeriesData: {ts_type}"
+        if not isinstance(time_series, TimeSeriesData):
+            msg = f"The first argument must be an instance of TimeSeriesData: {type(time_series)}"
             raise ValueError(msg)
-        metadata_type = ts_type.get_time_series_metadata_type()
+        metadata_type = time_series.get_time_series_metadata_type()
         metadata = metadata_type.from_data(time_series, **user_attributes)
 
         if not self._metadata_store.has_time_series(time_series.uuid):
@@ -150,14 +158,16 @@ class TimeSeriesManager:
         self,
         component: Component,
         variable_name: str | None = None,
-        time_series_type: Type[TimeSeriesData] = SingleTimeSeries,
+        time_series_type: Type[TimeSeriesData] | None = SingleTimeSeries,
         **user_attributes,
     ) -> bool:
-        """Return True if the component has time series matching the inputs."""
+        """Return True if the component has time series matching the inputs. Pass
+        time_series_type=None to match all types.
+        """
         return self._metadata_store.has_time_series_metadata(
             component,
             variable_name=variable_name,
-            time_series_type=time_series_type.__name__,
+            time_series_type=None if time_series_type is None else time_series_type.__name__,
             **user_attributes,
         )
 
@@ -177,7 +187,7 @@ class TimeSeriesManager:
             time_series_type=time_series_type,
             **user_attributes,
         )
-        return [self._get_by_metadata(x, start_time=start_time, length=length) for x in metadata]
+        return self._storage.get_time_series_many(metadata, start_time=start_time, length=length)
 
     def list_time_series_metadata(
         self,
@@ -198,10 +208,11 @@ class TimeSeriesManager:
         self,
         *components: Component,
         variable_name: str | None = None,
-        time_series_type: Type[TimeSeriesData] = SingleTimeSeries,
+        time_series_type: Type[TimeSeriesData] | None = SingleTimeSeries,
         **user_attributes: Any,
     ):
-        """Remove all time series arrays matching the inputs.
+        """Remove all time series arrays matching the inputs. Pass time_series_type=None to
+        match all types.
 
         Raises
         ------
@@ -211,16 +222,24 @@ class TimeSeriesManager:
             Raised if the manager was created in read-only mode.
         """
         self._handle_read_only()
+        type_name = None if time_series_type is None else time_series_type.__name__
         time_series_uuids = self._metadata_store.remove(
             *components,
             variable_name=variable_name,
-            time_series_type=time_series_type.__name__,
+            time_series_type=type_name,
             **user_attributes,
         )
+        if not time_series_uuids:
+            return
         missing_uuids = self._metadata_store.list_missing_time_series(time_series_uuids)
         for uuid in missing_uuids:
             self._storage.remove_time_series(uuid)
-            logger.info("Removed time series {}.{}", time_series_type, variable_name)
+        if missing_uuids:
+            label = ".".join(x for x in (type_name, variable_name) if x is not None)
+            if label:
+                logger.info("Removed {} time series arrays for {}", len(missing_uuids), label)
+            else:
+                logger.info("Removed {} time series arrays", len(missing_uuids))
 
     def copy(
         self,
@@ -273,8 +292,8 @@ class TimeSeriesManager:
         parent_dir: Path | str,
         **kwargs: Any,
     ) -> "TimeSeriesManager":
-        """Deserialize the class. Must also call add_reference_counts after deserializing
-        components.
+        """Deserialize the class. Time series associations are restored from the metadata
+        database, so no per-component work is required after deserializing components.
         """
         time_series_dir = Path(parent_dir) / data["directory"]
 
@@ -5,18 +5,19 @@ import itertools
 import json
 import os
 import sqlite3
+from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Optional, Sequence
+from typing import Any, Generator, Iterable, Optional, Sequence
 from uuid import UUID
 
 from loguru import logger
+from pydantic_core import from_json, to_json
 
 from infrasys.exceptions import ISAlreadyAttached, ISOperationNotAllowed, ISNotStored
 from infrasys import Component
 from infrasys.serialization import (
-    deserialize_value,
+    deserialize_type_by_name,
     serialize_value,
-    SerializedTypeMetadata,
     TYPE_METADATA,
 )
 from infrasys.time_series_models import TimeSeriesMetadata
@@ -30,6 +31,7 @@ class TimeSeriesMetadataStore:
 
     def __init__(self, con: sqlite3.Connection, initialize: bool = True):
         self._con = con
+        self._defer_commits = False
         if initialize:
             self._create_metadata_table()
         self._supports_sqlite_json = _does_sqlite_support_json()
@@ -80,6 +82,22 @@ class TimeSeriesMetadataStore:
         )
         execute(cur, f"CREATE INDEX by_ts_uuid ON {self.TABLE_NAME} (time_series_uuid)")
 
+    @contextmanager
+    def bulk_update(self) -> Generator[None, None, None]:
+        """Defer database commits until the block exits. Each change made inside the block
+        is still committed if an exception is raised.
+        """
+        if self._defer_commits:
+            yield
+            return
+
+        self._defer_commits = True
+        try:
+            yield
+        finally:
+            self._defer_commits = False
+            self._con.commit()
+
     def add(
         self,
         metadata: TimeSeriesMetadata,
@@ -102,24 +120,28 @@ class TimeSeriesMetadataStore:
         )
         cur = self._con.cursor()
 
-        query = f"SELECT COUNT(*) FROM {self.TABLE_NAME} WHERE {where_clause}"
-        res = execute(cur, query, params=params).fetchone()
-        if res[0] > 0:
+        query = f"SELECT 1 FROM {self.TABLE_NAME} WHERE {where_clause} LIMIT 1"
+        if execute(cur, query, params=params).fetchone() is not None:
             msg = f"Time series with {metadata=} is already stored."
             raise ISAlreadyAttached(msg)
 
+        # Every row shares the same metadata; serialize it once rather than per component.
+        time_series_uuid = str(metadata.time_series_uuid)
+        initial_time = str(metadata.initial_time)
+        resolution = str(metadata.resolution)
+        metadata_text = to_json(serialize_value(metadata)).decode()
         rows = [
             (
                 None,  # auto-assigned by sqlite
-                str(metadata.time_series_uuid),
+                time_series_uuid,
                 metadata.type,
-                str(metadata.initial_time),
-                str(metadata.resolution),
+                initial_time,
+                resolution,
                 metadata.variable_name,
                 str(component.uuid),
-                component.__class__.__name__,
+                type(component).__name__,
                 attribute_hash,
-                json.dumps(serialize_value(metadata)),
+                metadata_text,
             )
             for component in components
         ]
@@ -199,9 +221,8 @@ class TimeSeriesMetadataStore:
     def has_time_series(self, time_series_uuid: UUID) -> bool:
         """Return True if there is time series matching the UUID."""
         cur = self._con.cursor()
-        query = f"SELECT COUNT(*) FROM {self.TABLE_NAME} WHERE time_series_uuid = ?"
-        row = execute(cur, query, params=(str(time_series_uuid),)).fetchone()
-        return row[0] > 0
+        query = f"SELECT 1 FROM {self.TABLE_NAME} WHERE time_series_uuid = ? LIMIT 1"
+        return execute(cur, query, params=(str(time_series_uuid),)).fetchone() is not None
 
     def has_time_series_metadata(
         self,
@@ -220,7 +241,7 @@ class TimeSeriesMetadataStore:
         ):
             return True
 
-        if not self._supports_sqlite_json:
+        if user_attributes and not self._supports_sqlite_json:
             return bool(
                 self._list_metadata_no_sql_json(
                     component,
@@ -233,26 +254,28 @@ class TimeSeriesMetadataStore:
         where_clause, params = self._make_where_clause(
             (component,), variable_name, time_series_type, **user_attributes
         )
-        query = f"SELECT COUNT(*) FROM {self.TABLE_NAME} WHERE {where_clause}"
+        # Stop at the first match instead of counting all of them.
+        query = f"SELECT 1 FROM {self.TABLE_NAME} WHERE {where_clause} LIMIT 1"
         cur = self._con.cursor()
-        res = execute(cur, query, params=params).fetchone()
-        return res[0] > 0
+        return execute(cur, query, params=params).fetchone() is not None
 
-    def list_existing_time_series(self, time_series_uuids: list[UUID]) -> set[UUID]:
+    def list_existing_time_series(self, time_series_uuids: Iterable[UUID]) -> set[UUID]:
         """Return the UUIDs that are present."""
         cur = self._con.cursor()
-        params = tuple(str(x) for x in time_series_uuids)
-        uuids = ",".join(itertools.repeat("?", len(time_series_uuids)))
+        # Multiple components can share an array, so the input often repeats UUIDs.
+        params = tuple({str(x) for x in time_series_uuids})
+        uuids = ",".join(itertools.repeat("?", len(params)))
         query = (
-            f"SELECT time_series_uuid FROM {self.TABLE_NAME} WHERE time_series_uuid IN ({uuids})"
+            f"SELECT DISTINCT time_series_uuid FROM {self.TABLE_NAME} "
+            f"WHERE time_series_uuid IN ({uuids})"
         )
         rows = execute(cur, query, params=params).fetchall()
         return {UUID(x[0]) for x in rows}
 
-    def list_missing_time_series(self, time_series_uuids: list[UUID]) -> set[UUID]:
+    def list_missing_time_series(self, time_series_uuids: Iterable[UUID]) -> set[UUID]:
         """Return the UUIDs that are not present."""
-        existing_uuids = set(self.list_existing_time_series(time_series_uuids))
-        return set(time_series_uuids) - existing_uuids
+        unique_uuids = set(time_series_uuids)
+        return unique_uuids - self.list_existing_time_series(unique_uuids)
 
     def list_metadata(
         self,
@@ -353,15 +376,16 @@ class TimeSeriesMetadataStore:
             ):
                 ts_uuids.add(metadata.time_series_uuid)
                 ids.append(id_)
+            if not ids:
+                return []
             params = [str(x) for x in ids]
             id_str = ",".join(itertools.repeat("?", len(ids)))
             query = f"DELETE FROM {self.TABLE_NAME} WHERE id IN ({id_str})"
-            execute(cur, query, params=params)
-            count_deleted = execute(cur, "SELECT changes()").fetchall()[0][0]
+            count_deleted = execute(cur, query, params=params).rowcount
             if count_deleted != len(ids):
                 msg = f"Bug: Unexpected length mismatch {len(ts_uuids)=} {count_deleted=}"
                 raise Exception(msg)
-            self._con.commit()
+            self._commit()
             return list(ts_uuids)
 
         where_clause, params = self._make_where_clause(
@@ -369,11 +393,13 @@ class TimeSeriesMetadataStore:
         )
         query = f"SELECT time_series_uuid FROM {self.TABLE_NAME} WHERE {where_clause}"
         uuids = [UUID(x[0]) for x in execute(cur, query, params=params).fetchall()]
+        if not uuids:
+            return uuids
 
         query = f"DELETE FROM {self.TABLE_NAME} WHERE ({where_clause})"
-        execute(cur, query, params=params)
-        self._con.commit()
-        count_deleted = execute(cur, "SELECT changes()").fetchall()[0][0]
+        # The cursor reports the number of deleted rows, so no extra query is needed.
+        count_deleted = execute(cur, query, params=params).rowcount
+        self._commit()
         if len(uuids) != count_deleted:
             msg = f"Bug: Unexpected length mismatch: {len(uuids)=} {count_deleted=}"
             raise Exception(msg)
@@ -391,6 +417,10 @@ class TimeSeriesMetadataStore:
         try:
             cur.executemany(query, rows)
         finally:
+            self._commit()
+
+    def _commit(self) -> None:
+        if not self._defer_commits:
             self._con.commit()
 
     def _make_components_str(self, params: list[str], *components: Component) -> str:
@@ -568,10 +598,12 @@ def _compute_hash(text: bytes) -> str:
 
 
 def _deserialize_time_series_metadata(text: str) -> TimeSeriesMetadata:
-    data = json.loads(text)
-    type_metadata = SerializedTypeMetadata(**data.pop(TYPE_METADATA))
-    metadata = deserialize_value(data, type_metadata.fields)
-    return metadata
+    # The type metadata was written by serialize_value, so it is read directly instead of
+    # being validated for every row.
+    data = from_json(text)
+    fields = data.pop(TYPE_METADATA)["fields"]
+    metadata_type = deserialize_type_by_name(fields["module"], fields["type"])
+    return metadata_type(**data)
 
 
 def _does_sqlite_support_json() -> bool:
@@ -3,7 +3,7 @@
 import abc
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Any
+from typing import Any, Optional, Sequence
 from uuid import UUID
 
 from infrasys.time_series_models import TimeSeriesData, TimeSeriesMetadata
@@ -39,6 +39,17 @@ class TimeSeriesStorageBase(abc.ABC):
     ) -> TimeSeriesData:
         """Return a time series array."""
 
+    def get_time_series_many(
+        self,
+        metadata: Sequence[TimeSeriesMetadata],
+        start_time: datetime | None = None,
+        length: int | None = None,
+    ) -> list[TimeSeriesData]:
+        """Return the time series arrays for each metadata instance, in the same order.
+        Storage implementations can override this to read shared arrays only once.
+        """
+        return [self.get_time_series(x, start_time=start_time, length=length) for x in metadata]
+
     @abc.abstractmethod
     def remove_time_series(self, uuid: UUID) -> None:
         """Remove a time series array and return it."""
@@ -111,3 +111,51 @@ def test_copied_storage_system(simple_system_with_time_series):
 
     data_array_2 = simple_system_with_time_series.list_time_series(gen_component)[0].data
     assert np.array_equal(data_array_1, data_array_2)
+
+
+def test_list_time_series_shared_array():
+    """Test reading several time series that share one array."""
+    system = SimpleSystem()
+    bus = SimpleBus(name="test-bus", voltage=1.1)
+    gen1 = SimpleGenerator(name="gen1", active_power=1.0, rating=1.0, bus=bus, available=True)
+    system.add_components(bus, gen1)
+    ts = SingleTimeSeries.from_array(
+        data=range(100),
+        variable_name="active_power",
+        initial_time=datetime(year=2020, month=1, day=1),
+        resolution=timedelta(hours=1),
+    )
+    system.add_time_series(ts, gen1, scenario="low")
+    system.add_time_series(ts, gen1, scenario="high")
+    start_time = datetime(year=2020, month=1, day=1, hour=10)
+    time_series = system.list_time_series(gen1, start_time=start_time, length=5)
+    assert len(time_series) == 2
+    for ts2 in time_series:
+        assert isinstance(ts2, SingleTimeSeries)
+        assert ts2.uuid == ts.uuid
+        assert ts2.initial_time == start_time
+        assert np.array_equal(ts2.data, np.arange(10, 15))
+
+
+def test_serialize_read_only_system_in_place(tmp_path):
+    """Test re-saving a read-only system over the files that back its time series."""
+    system = SimpleSystem()
+    bus = SimpleBus(name="test-bus", voltage=1.1)
+    gen1 = SimpleGenerator(name="gen1", active_power=1.0, rating=1.0, bus=bus, available=True)
+    system.add_components(bus, gen1)
+    ts = SingleTimeSeries.from_array(
+        data=range(100),
+        variable_name="active_power",
+        initial_time=datetime(year=2020, month=1, day=1),
+        resolution=timedelta(hours=1),
+    )
+    system.add_time_series(ts, gen1)
+    filename = tmp_path / "system.json"
+    system.to_json(filename)
+
+    system2 = SimpleSystem.from_json(filename, time_series_read_only=True)
+    system2.to_json(filename, overwrite=True)
+
+    system3 = SimpleSystem.from_json(filename)
+    gen1b = system3.get_component(SimpleGenerator, gen1.name)
+    assert np.array_equal(system3.get_time_series(gen1b).data, np.arange(100))
@@ -56,6 +56,13 @@ def test_unit_deserialization():
     assert active_power.magnitude == 100
     assert str(active_power.units) == "kilowatt"
 
+    # Units are cached, but each call must return a new quantity.
+    active_power2 = ActivePower.from_dict(test_units)
+    assert active_power2 == active_power
+    assert active_power2 is not active_power
+    active_power2.ito("watt")
+    assert str(active_power.units) == "kilowatt"
+
 
 def test_base_unit_validation():
     # Check that new classes must define __base_unit__
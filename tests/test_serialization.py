@@ -1,18 +1,30 @@
 import json
 import random
 import os
+import zipfile
 from datetime import datetime, timedelta
+from typing import Optional
 
 import numpy as np
 import pytest
 from pydantic import WithJsonSchema
+from pydantic_core import to_json
 from typing_extensions import Annotated
 
 from infrasys import Location, SingleTimeSeries
-from infrasys.component import Component
+from infrasys.component import Component, serialize_component_reference
 from infrasys.quantities import Distance, ActivePower
-from infrasys.exceptions import ISOperationNotAllowed
+from infrasys.exceptions import ISConflictingArguments, ISOperationNotAllowed
 from infrasys.normalization import NormalizationMax
+from infrasys.serialization import (
+    CachedTypeHelper,
+    SerializedComponentReference,
+    SerializedQuantityType,
+    SerializedTypeMetadata,
+    deserialize_type_by_name,
+    serialize_type_metadata,
+)
+from infrasys.system import _SYSTEM_KEYS
 from .models.simple_system import (
     SimpleSystem,
     SimpleBus,
@@ -27,6 +39,12 @@ class ComponentWithPintQuantity(Component):
     distance: Annotated[Distance, WithJsonSchema({"type": "string"})]
 
 
+class ComponentWithReference(Component):
+    """Test component that can reference another component."""
+
+    other: Optional[Component] = None
+
+
 def test_serialization(tmp_path):
     system = SimpleSystem(name="test-system", description="a test system", my_attr=5)
     num_components_by_type = 5
@@ -185,6 +203,148 @@ def test_system_with_time_series_normalization(tmp_path, in_memory):
     assert ts2.normalization.max_value == length - 1
 
 
+def test_serialize_nan(tmp_path):
+    system = SimpleSystem()
+    bus = SimpleBus(name="test-bus", voltage=float("nan"))
+    system.add_components(bus)
+    filename = tmp_path / "system.json"
+    system.to_json(filename, indent=2)
+    system2 = SimpleSystem.from_json(filename)
+    assert np.isnan(system2.get_component(SimpleBus, "test-bus").voltage)
+
+
+def test_deserialize_components_out_of_order(tmp_path):
+    system = SimpleSystem(auto_add_composed_components=True)
+    gen = SimpleGenerator.example()
+    system.add_components(gen)
+    system.add_components(SimpleSubsystem(name="subsystem", generators=[gen]))
+    filename = tmp_path / "system.json"
+    system.to_json(filename)
+    data = json.loads(filename.read_text())
+    # Put every component before the components that it references.
+    data["components"].reverse()
+    filename.write_text(json.dumps(data))
+
+    system2 = SimpleSystem.from_json(filename)
+    subsystem = system2.get_component(SimpleSubsystem, "subsystem")
+    gen2 = system2.get_component(SimpleGenerator, gen.name)
+    assert subsystem.generators[0] is gen2
+    assert gen2.bus is system2.get_component(SimpleBus, gen.bus.name)
+    assert gen2.bus.coordinates is not None
+
+
+def test_from_dict_preserves_data(tmp_path):
+    system = SimpleSystem(auto_add_composed_components=True)
+    gen = SimpleGenerator.example()
+    system.add_components(gen)
+    system.add_components(SimpleSubsystem(name="subsystem", generators=[gen]))
+    filename = tmp_path / "system.json"
+    system.to_json(filename)
+    data = json.loads(filename.read_text())
+    original = json.loads(filename.read_text())
+
+    system2 = SimpleSystem.from_dict(data, tmp_path)
+    assert data == original
+    system3 = SimpleSystem.from_dict(data, tmp_path)
+    assert data == original
+    for system_ in (system2, system3):
+        subsystem = system_.get_component(SimpleSubsystem, "subsystem")
+        assert subsystem.generators[0] is system_.get_component(SimpleGenerator, gen.name)
+
+
+def test_from_json_calls_from_dict(tmp_path):
+    class CustomSystem(SimpleSystem):
+        from_dict_calls = 0
+
+        @classmethod
+        def from_dict(cls, data, time_series_parent_dir, upgrade_handler=None, **kwargs):
+            cls.from_dict_calls += 1
+            return super().from_dict(data, time_series_parent_dir, upgrade_handler, **kwargs)
+
+    system = CustomSystem(auto_add_composed_components=True)
+    system.add_components(SimpleGenerator.example())
+    filename = tmp_path / "system.json"
+    system.to_json(filename)
+    system2 = CustomSystem.from_json(filename)
+    assert CustomSystem.from_dict_calls == 1
+    assert system2.get_component(SimpleGenerator, "simple-gen") is not None
+
+
+def test_deserialize_circular_references(tmp_path):
+    system = SimpleSystem()
+    component1 = ComponentWithReference(name="component1")
+    component2 = ComponentWithReference(name="component2", other=component1)
+    system.add_components(component1, component2)
+    component1.other = component2
+    filename = tmp_path / "system.json"
+    system.to_json(filename)
+    with pytest.raises(ISOperationNotAllowed, match="circular references"):
+        SimpleSystem.from_json(filename)
+
+
+def test_cached_type_helper_fields_to_deserialize():
+    cached_types = CachedTypeHelper()
+    fields = cached_types.get_fields_to_deserialize(SimpleGenerator)
+    assert fields == ("bus",)
+    assert cached_types.get_fields_to_deserialize(SimpleGenerator) is fields
+    assert cached_types.get_fields_to_deserialize(SimpleBus) == ("coordinates",)
+    assert cached_types.get_fields_to_deserialize(ComponentWithPintQuantity) == ("distance",)
+    assert cached_types.get_fields_to_deserialize(Location) == ()
+
+
+def test_serialize_conflicting_system_attributes(tmp_path):
+    class ConflictingSystem(SimpleSystem):
+        def serialize_system_attributes(self):
+            return {"my_attr": self.my_attr, "time_series": None}
+
+    system = ConflictingSystem()
+    with pytest.raises(ISConflictingArguments, match="time_series"):
+        system.to_json(tmp_path / "system.json")
+
+    SimpleSystem(my_attr=1).to_json(tmp_path / "system2.json")
+    data = json.loads((tmp_path / "system2.json").read_text())
+    assert set(data) == _SYSTEM_KEYS | {"my_attr"}
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_serialize_with_outer_data(tmp_path, indent):
+    system = SimpleSystem(auto_add_composed_components=True)
+    system.add_components(SimpleGenerator.example())
+    outer = {"name": "parent", "nested": {"values": [1, 2]}}
+    filename = tmp_path / "system.json"
+    system.to_json(filename, indent=indent, data=outer)
+    assert outer == {"name": "parent", "nested": {"values": [1, 2]}}
+
+    text = filename.read_bytes()
+    data = json.loads(text)
+    assert len(data["system"]["components"]) == 3
+    assert text == to_json(data, indent=indent)
+
+
+def test_serialize_type_metadata():
+    expected = SerializedTypeMetadata(
+        fields=SerializedQuantityType(module=Distance.__module__, type="Distance")
+    ).model_dump()
+    metadata1 = serialize_type_metadata(Distance, SerializedQuantityType)
+    metadata2 = serialize_type_metadata(Distance, SerializedQuantityType)
+    assert metadata1 == metadata2 == expected
+    assert metadata1["fields"] is not metadata2["fields"]
+
+
+def test_deserialize_type_by_name():
+    assert deserialize_type_by_name(Distance.__module__, "Distance") is Distance
+
+
+def test_serialize_component_reference():
+    bus = SimpleBus.example()
+    expected = SerializedTypeMetadata(
+        fields=SerializedComponentReference(
+            module=SimpleBus.__module__, type="SimpleBus", uuid=bus.uuid
+        )
+    ).model_dump(by_alias=True)
+    assert serialize_component_reference(bus) == expected
+
+
 def test_json_schema():
     schema = ComponentWithPintQuantity.model_json_schema()
     assert isinstance(json.loads(json.dumps(schema)), dict)
@@ -212,3 +372,17 @@ def test_system_save(tmp_path, simple_system_with_time_series):
     assert not os.path.exists(fpath), f"Original folder {fpath} was not deleted sucessfully."
     zip_fpath = f"{fpath}.zip"
     assert os.path.exists(zip_fpath), f"Zip file {zip_fpath} does not exists"
+
+    with zipfile.ZipFile(zip_fpath) as zf:
+        names = zf.namelist()
+        assert fname in names
+        for info in zf.infolist():
+            if info.filename == fname:
+                assert info.compress_type == zipfile.ZIP_DEFLATED
+            else:
+                assert info.compress_type == zipfile.ZIP_STORED
+        zf.extractall(tmp_path / "extracted")
+    system = SimpleSystem.from_json(tmp_path / "extracted" / fname)
+    counts = system.time_series.metadata_store.get_time_series_counts()
+    orig_counts = simple_system.time_series.metadata_store.get_time_series_counts()
+    assert counts.time_series_count == orig_counts.time_series_count > 0
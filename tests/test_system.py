@@ -92,6 +92,10 @@ def test_get_components(simple_system: SimpleSystem):
     assert system.get_component_by_uuid(gen.uuid) is gen
     with pytest.raises(ISNotStored):
         system.get_component_by_uuid(uuid4())
+    uuids = [x.uuid for x in all_components]
+    assert system._components.get_by_uuid_many(uuids) == all_components
+    with pytest.raises(ISNotStored):
+        system._components.get_by_uuid_many([gen.uuid, uuid4()])
 
     stored_types = sorted((x.__name__ for x in system.get_component_types()))
     assert stored_types == [
@@ -217,6 +221,72 @@ def test_time_series_attach_from_array():
     assert np.array_equal(system.get_time_series(gen1, variable_name=variable_name).data, ts.data)
 
 
+def test_bulk_time_series():
+    system = SimpleSystem()
+    bus = SimpleBus(name="test-bus", voltage=1.1)
+    gens = [
+        SimpleGenerator(name=f"gen{i}", active_power=1.0, rating=1.0, bus=bus, available=True)
+        for i in range(5)
+    ]
+    system.add_components(bus, *gens)
+    start = datetime(year=2020, month=1, day=1)
+    resolution = timedelta(hours=1)
+    with system.bulk_time_series():
+        for gen in gens:
+            ts = SingleTimeSeries.from_array(range(24), "active_power", start, resolution)
+            system.add_time_series(ts, gen)
+            assert system.has_time_series(gen, variable_name="active_power")
+        with system.bulk_time_series():
+            system.remove_time_series(gens[0], variable_name="active_power")
+        assert not system.has_time_series(gens[0], variable_name="active_power")
+
+    assert not system.has_time_series(gens[0], variable_name="active_power")
+    for gen in gens[1:]:
+        assert system.has_time_series(gen, variable_name="active_power")
+
+
+def test_remove_time_series_log_message(caplog):
+    system = SimpleSystem()
+    bus = SimpleBus(name="test-bus", voltage=1.1)
+    gen1 = SimpleGenerator(name="gen1", active_power=1.0, rating=1.0, bus=bus, available=True)
+    gen2 = SimpleGenerator(name="gen2", active_power=1.0, rating=1.0, bus=bus, available=True)
+    system.add_components(bus, gen1, gen2)
+    start = datetime(year=2020, month=1, day=1)
+    resolution = timedelta(hours=1)
+    for gen in (gen1, gen2):
+        ts = SingleTimeSeries.from_array(range(24), "active_power", start, resolution)
+        system.add_time_series(ts, gen)
+
+    with caplog.at_level("INFO"):
+        system.remove_time_series(gen1, variable_name="active_power")
+        system.remove_component(gen2)
+    messages = [x.message for x in caplog.records if x.message.startswith("Removed 1")]
+    assert messages == [
+        "Removed 1 time series arrays for SingleTimeSeries.active_power",
+        "Removed 1 time series arrays",
+    ]
+
+
+def test_bulk_time_series_serialize(tmp_path):
+    system = SimpleSystem()
+    bus = SimpleBus(name="test-bus", voltage=1.1)
+    gen = SimpleGenerator(name="gen1", active_power=1.0, rating=1.0, bus=bus, available=True)
+    system.add_components(bus, gen)
+    ts = SingleTimeSeries.from_array(
+        range(24), "active_power", datetime(year=2020, month=1, day=1), timedelta(hours=1)
+    )
+    filename = tmp_path / "system.json"
+    with system.bulk_time_series():
+        system.add_time_series(ts, gen)
+        system.to_json(filename)
+        system.add_time_series(ts, gen, scenario="high")
+
+    assert system.has_time_series(gen, variable_name="active_power", scenario="high")
+    system2 = SimpleSystem.from_json(filename)
+    gen2 = system2.get_component(SimpleGenerator, "gen1")
+    assert len(system2.list_time_series(gen2, variable_name="active_power")) == 1
+
+
 def test_time_series():
     system = SimpleSystem()
     bus = SimpleBus(name="test-bus", voltage=1.1)